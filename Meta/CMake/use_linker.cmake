@@ -30,3 +30,13 @@ if (LAGOM_USE_LINKER)
         set(CMAKE_MODULE_LINKER_FLAGS "${CMAKE_MODULE_LINKER_FLAGS} ${LINKER_FLAG}")
     endif()
 endif()
+
+if (LAGOM_LINK_POOL_SIZE)
+    # Linking is the most memory-hungry part of the build, so allow limiting how many link jobs run at once.
+    # This file is included both by Lagom and by the top-level project, so only define the pool once.
+    get_property(job_pools GLOBAL PROPERTY JOB_POOLS)
+    if (NOT job_pools MATCHES "(^|;)link_pool=")
+        set_property(GLOBAL APPEND PROPERTY JOB_POOLS link_pool=${LAGOM_LINK_POOL_SIZE})
+    endif()
+    set(CMAKE_JOB_POOL_LINK link_pool)
+endif()
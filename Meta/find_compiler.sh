@@ -2,49 +2,158 @@
 
 HOST_COMPILER=""
 
+MIN_CLANG_MAJOR_VERSION=17
+MIN_GCC_MAJOR_VERSION=13
+
+# Used by probe_compiler_version to pick the major version out of the clang and GCC version lines.
+CLANG_VERSION_REGEX='version ([0-9]+)\.'
+GCC_VERSION_REGEX='\) ([0-9]+)\.'
+
+CLANG_CANDIDATES=(clang clang-17 clang-18 /opt/homebrew/opt/llvm/bin/clang)
+GCC_CANDIDATES=(egcc gcc gcc-13 gcc-14 /usr/local/bin/gcc-{13,14} /opt/homebrew/bin/gcc-{13,14})
+
+# Newline-separated "<compiler>\t<major version>\t<version line>" records of every compiler we
+# have already run, so that find_newest_compiler and is_supported_compiler share a single probe per
+# compiler. A failed probe is recorded with an empty major version.
+DETECTED_COMPILER_VERSIONS=""
+
+# Sets COMPILER_VERSION_LINE to the first line of `--version` and COMPILER_MAJOR_VERSION to the
+# major version parsed out of it (e.g. "clang version 17.0.6" or "gcc (GCC) 13.2.0"), so that we
+# only have to spawn the compiler once. The whole output is captured so that a failing `--version`
+# reliably rejects the compiler. Falls back to `-dumpversion` if the line isn't recognized.
+probe_compiler_version() {
+    local COMPILER="$1"
+    COMPILER_VERSION_LINE=""
+    COMPILER_MAJOR_VERSION=""
+
+    local VERSION_OUTPUT=""
+    VERSION_OUTPUT="$("$COMPILER" --version 2>&1)" || return 1
+    COMPILER_VERSION_LINE="${VERSION_OUTPUT%%$'\n'*}"
+
+    if [[ "$COMPILER_VERSION_LINE" =~ $CLANG_VERSION_REGEX ]] || [[ "$COMPILER_VERSION_LINE" =~ $GCC_VERSION_REGEX ]]; then
+        COMPILER_MAJOR_VERSION="${BASH_REMATCH[1]}"
+        return 0
+    fi
+
+    local VERSION=""
+    VERSION="$("$COMPILER" -dumpversion 2> /dev/null)" || return 1
+    COMPILER_MAJOR_VERSION="${VERSION%%.*}"
+}
+
+# Usage: remember_compiler_version <Compiler> <Major Version> <Version Line>
+remember_compiler_version() {
+    DETECTED_COMPILER_VERSIONS+="$1"$'\t'"$2"$'\t'"$3"$'\n'
+}
+
+# Like probe_compiler_version, but only runs each compiler once.
+detect_compiler_version() {
+    local COMPILER="$1"
+
+    local NAME="" MAJOR_VERSION="" VERSION_LINE=""
+    while IFS=$'\t' read -r NAME MAJOR_VERSION VERSION_LINE; do
+        if [ "$NAME" = "$COMPILER" ]; then
+            COMPILER_MAJOR_VERSION="$MAJOR_VERSION"
+            COMPILER_VERSION_LINE="$VERSION_LINE"
+            if [ -n "$COMPILER_MAJOR_VERSION" ]; then
+                return 0
+            fi
+            return 1
+        fi
+    done <<< "$DETECTED_COMPILER_VERSIONS"
+
+    if probe_compiler_version "$COMPILER"; then
+        remember_compiler_version "$COMPILER" "$COMPILER_MAJOR_VERSION" "$COMPILER_VERSION_LINE"
+        return 0
+    fi
+    remember_compiler_version "$COMPILER" "" ""
+    return 1
+}
+
 is_supported_compiler() {
     local COMPILER="$1"
     if [ -z "$COMPILER" ]; then
         return 1
     fi
 
-    local VERSION=""
-    VERSION="$($COMPILER -dumpversion 2> /dev/null)" || return 1
-    local MAJOR_VERSION=""
-    MAJOR_VERSION="${VERSION%%.*}"
-    if $COMPILER --version 2>&1 | grep "Apple clang" >/dev/null; then
+    detect_compiler_version "$COMPILER" || return 1
+    if [[ "$COMPILER_VERSION_LINE" == *"Apple clang"* ]]; then
         # Apple Clang version check
-        BUILD_VERSION=$(echo | $COMPILER -dM -E - | grep __apple_build_version__ | cut -d ' ' -f3)
+        BUILD_VERSION=$(echo | "$COMPILER" -dM -E - | grep __apple_build_version__ | cut -d ' ' -f3)
         # Xcode 14.3, based on upstream LLVM 15
         [ "$BUILD_VERSION" -ge 14030022 ] && return 0
-    elif $COMPILER --version 2>&1 | grep "clang" >/dev/null; then
+    elif [[ "$COMPILER_VERSION_LINE" == *"clang"* ]]; then
         # Clang version check
-        [ "$MAJOR_VERSION" -ge 17 ] && return 0
+        [ "$COMPILER_MAJOR_VERSION" -ge "$MIN_CLANG_MAJOR_VERSION" ] && return 0
     else
         # GCC version check
-        [ "$MAJOR_VERSION" -ge 13 ] && return 0
+        [ "$COMPILER_MAJOR_VERSION" -ge "$MIN_GCC_MAJOR_VERSION" ] && return 0
     fi
     return 1
 }
 
+# Usage: find_newest_compiler <Minimum Major Version> <Candidates...>
+# Picks the first candidate that is at least the minimum version, or the newest one otherwise.
+# The first installed candidate is probed on its own, as it usually is new enough, and there is no
+# point in starting (possibly slow) compilers further down the list. Only if it is too old are the
+# remaining candidates probed in parallel, as each probe spends nearly all of its time waiting for
+# the compiler to start up. Unlike the first candidate, all of those are started, even if an earlier
+# one turns out to be new enough.
 find_newest_compiler() {
+    local MIN_MAJOR_VERSION="$1"
+    shift
+
+    local i
+    local CANDIDATES=()
+    for CANDIDATE in "$@"; do
+        if command -v "$CANDIDATE" >/dev/null 2>&1; then
+            CANDIDATES+=("$CANDIDATE")
+        fi
+    done
+
+    HOST_COMPILER=""
+    [ "${#CANDIDATES[@]}" -gt 0 ] || return 0
+
     local BEST_VERSION=0
     local BEST_CANDIDATE=""
-    for CANDIDATE in "$@"; do
-        if ! command -v "$CANDIDATE" >/dev/null 2>&1; then
-            continue
+    if detect_compiler_version "${CANDIDATES[0]}"; then
+        if [ "$COMPILER_MAJOR_VERSION" -ge "$MIN_MAJOR_VERSION" ]; then
+            HOST_COMPILER="${CANDIDATES[0]}"
+            return 0
         fi
-        if ! $CANDIDATE -dumpversion >/dev/null 2>&1; then
-            continue
+        BEST_VERSION=$COMPILER_MAJOR_VERSION
+        BEST_CANDIDATE="${CANDIDATES[0]}"
+    fi
+
+    # Each probe prints a single "<index>\t<major version>\t<version line>" record, which is short
+    # enough to be written to the pipe in one go, so records of parallel probes don't interleave.
+    local MAJOR_VERSIONS=()
+    local INDEX="" MAJOR_VERSION="" VERSION_LINE=""
+    while IFS=$'\t' read -r INDEX MAJOR_VERSION VERSION_LINE; do
+        MAJOR_VERSIONS[INDEX]="$MAJOR_VERSION"
+        remember_compiler_version "${CANDIDATES[INDEX]}" "$MAJOR_VERSION" "$VERSION_LINE"
+    done < <(
+        for (( i = 1; i < ${#CANDIDATES[@]}; i++ )); do
+            (
+                probe_compiler_version "${CANDIDATES[i]}" || exit 0
+                printf '%s\t%s\t%s\n' "$i" "$COMPILER_MAJOR_VERSION" "$COMPILER_VERSION_LINE"
+            ) &
+        done
+        wait
+    )
+
+    for (( i = 1; i < ${#CANDIDATES[@]}; i++ )); do
+        MAJOR_VERSION="${MAJOR_VERSIONS[i]:-}"
+        [ -n "$MAJOR_VERSION" ] || continue
+        if [ "$MAJOR_VERSION" -ge "$MIN_MAJOR_VERSION" ]; then
+            BEST_CANDIDATE="${CANDIDATES[i]}"
+            break
         fi
-        local VERSION=""
-        VERSION="$($CANDIDATE -dumpversion)"
-        local MAJOR_VERSION="${VERSION%%.*}"
         if [ "$MAJOR_VERSION" -gt "$BEST_VERSION" ]; then
             BEST_VERSION=$MAJOR_VERSION
-            BEST_CANDIDATE="$CANDIDATE"
+            BEST_CANDIDATE="${CANDIDATES[i]}"
         fi
     done
+
     HOST_COMPILER=$BEST_CANDIDATE
 }
 
@@ -56,14 +165,14 @@ pick_host_compiler() {
         return
     fi
 
-    find_newest_compiler clang clang-17 clang-18 /opt/homebrew/opt/llvm/bin/clang
+    find_newest_compiler "$MIN_CLANG_MAJOR_VERSION" "${CLANG_CANDIDATES[@]}"
     if is_supported_compiler "$HOST_COMPILER"; then
         export CC="${HOST_COMPILER}"
         export CXX="${HOST_COMPILER/clang/clang++}"
         return
     fi
 
-    find_newest_compiler egcc gcc gcc-13 gcc-14 /usr/local/bin/gcc-{13,14} /opt/homebrew/bin/gcc-{13,14}
+    find_newest_compiler "$MIN_GCC_MAJOR_VERSION" "${GCC_CANDIDATES[@]}"
     if is_supported_compiler "$HOST_COMPILER"; then
         export CC="${HOST_COMPILER}"
         export CXX="${HOST_COMPILER/gcc/g++}"
@@ -71,8 +180,8 @@ pick_host_compiler() {
     fi
 
     if [ "$(uname -s)" = "Darwin" ]; then
-        die "Please make sure that Xcode 14.3, Homebrew Clang 17, or higher is installed."
+        die "Please make sure that Xcode 14.3, Homebrew Clang ${MIN_CLANG_MAJOR_VERSION}, or higher is installed."
     else
-        die "Please make sure that GCC version 13, Clang version 17, or higher is installed."
+        die "Please make sure that GCC version ${MIN_GCC_MAJOR_VERSION}, Clang version ${MIN_CLANG_MAJOR_VERSION}, or higher is installed."
     fi
 }
@@ -6,7 +6,7 @@ BUILD_PRESET=${BUILD_PRESET:-default}
 
 ARG0=$0
 print_help() {
-    NAME=$(basename "$ARG0")
+    NAME="${ARG0##*/}"
     cat <<EOF
 Usage: $NAME COMMAND [ARGS...]
   Supported COMMANDs:
@@ -48,7 +48,7 @@ usage() {
 CMD=$1
 [ -n "$CMD" ] || usage
 shift
-if [ "$CMD" = "help" ]; then
+if [ "$CMD" = "help" ] || [ "$CMD" = "-h" ] || [ "$CMD" = "--help" ]; then
     print_help
     exit 0
 fi
@@ -66,7 +66,12 @@ exit_if_running_as_root "Do not run ladybird.sh as root, your Build directory wi
 CMAKE_ARGS=()
 CMD_ARGS=( "$@" )
 
-if [ "$(uname -s)" = Linux ] && [ "$(uname -m)" = "aarch64" ]; then
+HOST_SYSTEM_NAME="$(uname -s)"
+
+# Executables that are installed into the Ladybird.app bundle on macOS.
+MAC_BUNDLE_TARGETS_REGEX='^(headless-browser|ImageDecoder|Ladybird|RequestServer|WebContent|WebDriver|WebWorker)$'
+
+if [ "$HOST_SYSTEM_NAME" = Linux ] && [ "$(uname -m)" = "aarch64" ]; then
     PKGCONFIG=$(which pkg-config)
     GN=$(command -v gn || echo "")
     CMAKE_ARGS+=("-DPKG_CONFIG_EXECUTABLE=$PKGCONFIG")
@@ -83,23 +88,97 @@ EOF
 
 fi
 
+MIN_CMAKE_VERSION=3.25
+
+# Results of the host setup checks are remembered in this file, so that warm runs can skip them.
+# Each line holds one value: the config key, CC, CXX, and the cmake whose version was checked.
+LADYBIRD_CONFIG_FILE=""
+LADYBIRD_CONFIG_KEY=""
+CACHED_CMAKE=""
+
+# The minimum versions are part of the key, so that raising one of them re-runs the checks.
+ladybird_config_key() {
+    printf '%s\n' "$PATH" "${CC:-}" "${CXX:-}" "${CLANG_CANDIDATES[@]}" "${GCC_CANDIDATES[@]}" \
+        "$MIN_CLANG_MAJOR_VERSION" "$MIN_GCC_MAJOR_VERSION" "$MIN_CMAKE_VERSION" | cksum
+}
+
+# Reuses the compilers picked by a previous run, as long as the config key is unchanged, and the
+# picked compilers still exist and are older than the config file. The latter only goes by mtime,
+# so a compiler that is replaced by one with an older mtime (as some package managers preserve the
+# upstream timestamps) is not noticed. Remove Build/.ladybird-config to redo the checks in that case.
+load_ladybird_config() {
+    [ -f "$LADYBIRD_CONFIG_FILE" ] || return 1
+
+    local CACHED_KEY="" CACHED_CC="" CACHED_CXX=""
+    { IFS= read -r CACHED_KEY && IFS= read -r CACHED_CC && IFS= read -r CACHED_CXX && IFS= read -r CACHED_CMAKE; } < "$LADYBIRD_CONFIG_FILE" || return 1
+    [ "$CACHED_KEY" = "$LADYBIRD_CONFIG_KEY" ] || return 1
+
+    local CACHED_COMPILER=""
+    for CACHED_COMPILER in "$CACHED_CC" "$CACHED_CXX"; do
+        CACHED_COMPILER="$(command -v "$CACHED_COMPILER")" || return 1
+        [ "$LADYBIRD_CONFIG_FILE" -nt "$CACHED_COMPILER" ] || return 1
+    done
+
+    export CC="$CACHED_CC"
+    export CXX="$CACHED_CXX"
+}
+
+save_ladybird_config() {
+    mkdir -p "$LADYBIRD_SOURCE_DIR/Build"
+    printf '%s\n' "$LADYBIRD_CONFIG_KEY" "$CC" "$CXX" "$CACHED_CMAKE" > "$LADYBIRD_CONFIG_FILE"
+}
+
+ensure_cmake_version() {
+    # Set LADYBIRD_SKIP_CMAKE_VERSION_CHECK to skip probing cmake, e.g. on CI where the version is known.
+    [ -z "$LADYBIRD_SKIP_CMAKE_VERSION_CHECK" ] || return 0
+
+    local CMAKE_PATH=""
+    CMAKE_PATH="$(command -v cmake)" || true
+    if [ -n "$CMAKE_PATH" ] && [ "$CMAKE_PATH" = "$CACHED_CMAKE" ] && [ "$LADYBIRD_CONFIG_FILE" -nt "$CMAKE_PATH" ]; then
+        return 0
+    fi
+
+    check_program_version_at_least CMake cmake "$MIN_CMAKE_VERSION" || exit 1
+    CACHED_CMAKE="$CMAKE_PATH"
+    save_ladybird_config
+}
+
 create_build_dir() {
-    check_program_version_at_least CMake cmake 3.25 || exit 1
+    ensure_cmake_version
     cmake --preset "$BUILD_PRESET" "${CMAKE_ARGS[@]}" -S "$LADYBIRD_SOURCE_DIR" -B "$BUILD_DIR"
 }
 
 cmd_with_target() {
-    pick_host_compiler
+    ensure_ladybird_source_dir
+
+    LADYBIRD_CONFIG_FILE="$LADYBIRD_SOURCE_DIR/Build/.ladybird-config"
+    LADYBIRD_CONFIG_KEY="$(ladybird_config_key)"
+    if ! load_ladybird_config; then
+        CACHED_CMAKE=""
+        pick_host_compiler
+        save_ladybird_config
+    fi
     CMAKE_ARGS+=("-DCMAKE_C_COMPILER=${CC}")
     CMAKE_ARGS+=("-DCMAKE_CXX_COMPILER=${CXX}")
 
-    ensure_ladybird_source_dir
-
     BUILD_DIR=$(get_build_dir "$BUILD_PRESET")
 
     CMAKE_ARGS+=("-DCMAKE_INSTALL_PREFIX=$LADYBIRD_SOURCE_DIR/Build/ladybird-install-${BUILD_PRESET}")
 
-    export PATH="$LADYBIRD_SOURCE_DIR/Toolchain/Local/cmake/bin:$LADYBIRD_SOURCE_DIR/Toolchain/Local/vcpkg/bin:$PATH"
+    # ccache (or sccache) is picked up automatically by CMake, set LADYBIRD_NO_CCACHE to opt out of it.
+    # Like all CMAKE_ARGS, this only applies when the build directory is configured. The launchers
+    # are cache variables, so also drop any that a previous configure left behind.
+    if [ -n "$LADYBIRD_NO_CCACHE" ]; then
+        CMAKE_ARGS+=("-DENABLE_LAGOM_CCACHE=OFF" "-UCMAKE_C_COMPILER_LAUNCHER" "-UCMAKE_CXX_COMPILER_LAUNCHER")
+    fi
+
+    # PATH is inherited by anything we run, including nested invocations of this script, so only
+    # prepend the toolchain directories if they aren't there already.
+    local TOOLCHAIN_PATH="$LADYBIRD_SOURCE_DIR/Toolchain/Local/cmake/bin:$LADYBIRD_SOURCE_DIR/Toolchain/Local/vcpkg/bin"
+    case ":$PATH:" in
+        *":$TOOLCHAIN_PATH:"*) ;;
+        *) export PATH="$TOOLCHAIN_PATH:$PATH" ;;
+    esac
     export VCPKG_ROOT="$LADYBIRD_SOURCE_DIR/Toolchain/Tarballs/vcpkg"
 }
 
@@ -120,31 +199,48 @@ run_tests() {
 }
 
 build_target() {
-    # Get either the environment MAKEJOBS or all processors via CMake
-    [ -z "$MAKEJOBS" ] && MAKEJOBS=$(cmake -P "$LADYBIRD_SOURCE_DIR/Meta/CMake/processor-count.cmake")
+    # Ninja already picks a sensible number of jobs and respects job pools, so only override it
+    # if MAKEJOBS (or CMake's own CMAKE_BUILD_PARALLEL_LEVEL) is set in the environment.
+    local JOBS="${MAKEJOBS:-${CMAKE_BUILD_PARALLEL_LEVEL:-}}"
+    local JOBS_ARGS=()
+    if [ -n "$JOBS" ]; then
+        JOBS_ARGS+=("-j" "$JOBS")
+    fi
 
     # With zero args, we are doing a standard "build"
     # With multiple args, we are doing an install/run
     if [ $# -eq 0 ]; then
-        CMAKE_BUILD_PARALLEL_LEVEL="$MAKEJOBS" cmake --build "$BUILD_DIR"
+        cmake --build "$BUILD_DIR" "${JOBS_ARGS[@]}"
     else
-        ninja -j "$MAKEJOBS" -C "$BUILD_DIR" -- "$@"
+        ninja "${JOBS_ARGS[@]}" -C "$BUILD_DIR" -- "$@"
     fi
 }
 
 delete_target() {
     [ ! -d "$BUILD_DIR" ] || rm -rf "$BUILD_DIR"
 
+    # Forget the host setup, so that it is detected again on the next run
+    [ ! -f "$LADYBIRD_CONFIG_FILE" ] || rm "$LADYBIRD_CONFIG_FILE"
+    CACHED_CMAKE=""
+
     # Delete the vcpkg user variables created by this script if they exist
     VCPKG_USER_VARS="$LADYBIRD_SOURCE_DIR/Meta/CMake/vcpkg/user-variables.cmake"
     [ ! -f "$VCPKG_USER_VARS" ] || rm "$VCPKG_USER_VARS"
 }
 
 build_vcpkg() {
-    ( cd "$LADYBIRD_SOURCE_DIR/Toolchain" && python3 ./BuildVcpkg.py )
+    python3 "$LADYBIRD_SOURCE_DIR/Toolchain/BuildVcpkg.py"
 }
 
 ensure_toolchain() {
+    # Skip bootstrapping vcpkg again if BuildVcpkg.py hasn't changed since it last succeeded, as long
+    # as the vcpkg checkout and binary it produced are still around.
+    local VCPKG_STAMP="$LADYBIRD_SOURCE_DIR/Toolchain/Local/vcpkg/.bootstrapped"
+    if [ "$VCPKG_STAMP" -nt "$LADYBIRD_SOURCE_DIR/Toolchain/BuildVcpkg.py" ] \
+        && [ -x "$LADYBIRD_SOURCE_DIR/Toolchain/Local/vcpkg/bin/vcpkg" ] \
+        && [ -d "$VCPKG_ROOT" ]; then
+        return
+    fi
     build_vcpkg
 }
 
@@ -180,7 +276,7 @@ run_gdb() {
         GDB_ARGS+=( "$PASS_ARG_TO_GDB" )
     fi
     if [ "$LAGOM_EXECUTABLE" = "ladybird" ]; then
-        if [ "$(uname -s)" = "Darwin" ]; then
+        if [ "$HOST_SYSTEM_NAME" = "Darwin" ]; then
             LAGOM_EXECUTABLE="Ladybird.app"
         else
             LAGOM_EXECUTABLE="Ladybird"
@@ -209,67 +305,83 @@ build_and_run_lagom_target() {
 
     build_target "${lagom_target}"
 
-    if [[ "$lagom_target" =~ ^(headless-browser|ImageDecoder|Ladybird|RequestServer|WebContent|WebDriver|WebWorker)$ ]] && [ "$(uname -s)" = "Darwin" ]; then
+    if [[ "$lagom_target" =~ $MAC_BUNDLE_TARGETS_REGEX ]] && [ "$HOST_SYSTEM_NAME" = "Darwin" ]; then
         "$BUILD_DIR/bin/Ladybird.app/Contents/MacOS/$lagom_target" "${lagom_args[@]}"
     else
         "$BUILD_DIR/bin/$lagom_target" "${lagom_args[@]}"
     fi
 }
 
-if [[ "$CMD" =~ ^(build|install|run|gdb|test|rebuild|recreate|addr2line)$ ]]; then
+prepare_target() {
     cmd_with_target
-    [[ "$CMD" != "recreate" && "$CMD" != "rebuild" ]] || delete_target
     ensure_toolchain
     ensure_target
-    case "$CMD" in
-        build)
-            build_target "${CMD_ARGS[@]}"
-            ;;
-        install)
-            build_target
-            build_target install
-            ;;
-        run)
-            build_and_run_lagom_target
-            ;;
-        gdb)
-          [ $# -ge 1 ] || usage
-          build_target "${CMD_ARGS[@]}"
-          run_gdb "${CMD_ARGS[@]}"
-          ;;
-        test)
-            build_target
-            run_tests "${CMD_ARGS[0]}"
-            ;;
-        rebuild)
-            build_target "${CMD_ARGS[@]}"
-            ;;
-        recreate)
-            ;;
-        addr2line)
-            build_target
-            [ $# -ge 2 ] || usage
-            BINARY_FILE="$1"; shift
-            BINARY_FILE_PATH="$BUILD_DIR/$BINARY_FILE"
-            command -v addr2line >/dev/null 2>&1 || die "Please install addr2line!"
-            ADDR2LINE=addr2line
-            if [ -x "$BINARY_FILE_PATH" ]; then
-                "$ADDR2LINE" -e "$BINARY_FILE_PATH" "$@"
-            else
-                find "$BUILD_DIR" -name "$BINARY_FILE" -executable -type f -exec "$ADDR2LINE" -e {} "$@" \;
-            fi
-            ;;
-        *)
-            build_target "$CMD" "${CMD_ARGS[@]}"
-            ;;
-    esac
-elif [ "$CMD" = "delete" ]; then
+}
+
+recreate_target() {
     cmd_with_target
     delete_target
-elif [ "$CMD" = "vcpkg" ]; then
-    cmd_with_target
     ensure_toolchain
-else
-    >&2 echo "Unknown command: $CMD"
-    usage
-fi
+    ensure_target
+}
+
+# Each command only does the setup it actually needs, and validates its arguments before doing any of it.
+case "$CMD" in
+    build)
+        prepare_target
+        build_target "${CMD_ARGS[@]}"
+        ;;
+    install)
+        prepare_target
+        build_target
+        build_target install
+        ;;
+    run)
+        prepare_target
+        build_and_run_lagom_target
+        ;;
+    gdb)
+        [ $# -ge 1 ] || usage
+        prepare_target
+        build_target "${CMD_ARGS[@]}"
+        run_gdb "${CMD_ARGS[@]}"
+        ;;
+    test)
+        prepare_target
+        build_target
+        run_tests "${CMD_ARGS[0]}"
+        ;;
+    rebuild)
+        recreate_target
+        build_target "${CMD_ARGS[@]}"
+        ;;
+    recreate)
+        recreate_target
+        ;;
+    addr2line)
+        [ $# -ge 2 ] || usage
+        command -v addr2line >/dev/null 2>&1 || die "Please install addr2line!"
+        prepare_target
+        build_target
+        BINARY_FILE="$1"; shift
+        BINARY_FILE_PATH="$BUILD_DIR/$BINARY_FILE"
+        ADDR2LINE=addr2line
+        if [ -x "$BINARY_FILE_PATH" ]; then
+            "$ADDR2LINE" -e "$BINARY_FILE_PATH" "$@"
+        else
+            find "$BUILD_DIR" -name "$BINARY_FILE" -executable -type f -exec "$ADDR2LINE" -e {} "$@" \;
+        fi
+        ;;
+    delete)
+        cmd_with_target
+        delete_target
+        ;;
+    vcpkg)
+        cmd_with_target
+        ensure_toolchain
+        ;;
+    *)
+        >&2 echo "Unknown command: $CMD"
+        usage
+        ;;
+esac
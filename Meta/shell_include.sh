@@ -25,7 +25,13 @@ check_program_version_at_least()
         echo "ERROR: Cannot find $2 ($1)"
         return 1
     fi
-    v=$("$2" --version 2>&1 | grep -E -o '[0-9]+\.[0-9\.]+[a-z]*' | head -n1)
+    local version_output version_regex='[0-9]+\.[0-9.]+[a-z]*'
+    version_output=$("$2" --version 2>&1) || true
+    if [[ "$version_output" =~ $version_regex ]]; then
+        v="${BASH_REMATCH[0]}"
+    else
+        v=""
+    fi
     if printf '%s\n' "$3" "$v" | sort --version-sort --check &>/dev/null; then
         echo "ok, found $v"
         return 0;
@@ -51,6 +57,16 @@ get_number_of_processing_units() {
 }
 
 get_top_dir() {
+    # This file lives in Meta/, so the top dir is its parent. Resolve that with shell builtins to
+    # avoid spawning git, and only fall back to git for unusual checkouts.
+    local SCRIPT_DIR="."
+    if [[ "${BASH_SOURCE[0]}" == */* ]]; then
+        SCRIPT_DIR="${BASH_SOURCE[0]%/*}"
+    fi
+    if [ -f "$SCRIPT_DIR/../CMakeLists.txt" ]; then
+        (cd "$SCRIPT_DIR/.." && pwd -P)
+        return
+    fi
     git rev-parse --show-toplevel
 }
 
@@ -61,9 +77,9 @@ ensure_ladybird_source_dir() {
     fi
 }
 
+# Note: Callers are expected to have called ensure_ladybird_source_dir already. This is usually
+#       invoked in a command substitution, where a lookup of the top dir wouldn't persist anyway.
 get_build_dir() {
-    ensure_ladybird_source_dir
-
     # Note: Keep in sync with buildDir defaults in CMakePresets.json
     case "$1" in
         "default")
@@ -13,6 +13,9 @@ def main() -> int:
     git_repo = "https://github.com/microsoft/vcpkg.git"
     git_rev = "2960d7d80e8d09c84ae8abf15c12196c2ca7d39a"  # 2024.09.30
 
+    # Meta/ladybird.sh skips running this script as long as this stamp is newer than the script itself.
+    bootstrapped_stamp = script_dir / "Local" / "vcpkg" / ".bootstrapped"
+
     tarball_dir = script_dir / "Tarballs"
     tarball_dir.mkdir(parents=True, exist_ok=True)
     vcpkg_checkout = tarball_dir / "vcpkg"
@@ -24,6 +27,8 @@ def main() -> int:
             ["git", "-C", vcpkg_checkout, "rev-parse", "HEAD"]).strip().decode()
 
         if bootstrapped_vcpkg_version == git_rev:
+            bootstrapped_stamp.parent.mkdir(parents=True, exist_ok=True)
+            bootstrapped_stamp.touch()
             return 0
 
     print(f"Building vcpkg@{git_rev}")
@@ -32,7 +37,7 @@ def main() -> int:
     subprocess.check_call(args=["git", "checkout", git_rev], cwd=vcpkg_checkout)
 
     bootstrap_script = "bootstrap-vcpkg.bat" if os.name == 'nt' else "bootstrap-vcpkg.sh"
-    subprocess.check_call(args=[vcpkg_checkout / bootstrap_script, "-disableMetrics"], cwd=vcpkg_checkout, shell=True)
+    subprocess.check_call(args=[vcpkg_checkout / bootstrap_script, "-disableMetrics"], cwd=vcpkg_checkout)
 
     install_dir = script_dir / "Local" / "vcpkg" / "bin"
     install_dir.mkdir(parents=True, exist_ok=True)
@@ -40,6 +45,8 @@ def main() -> int:
     vcpkg_name = "vcpkg.exe" if os.name == 'nt' else "vcpkg"
     shutil.copy(vcpkg_checkout / vcpkg_name, install_dir / vcpkg_name)
 
+    bootstrapped_stamp.touch()
+
     return 0
 
 